@@ -14,19 +14,57 @@ Endpoints:
     GET /stats - API statistics
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from starlette.routing import Route
 
+import orjson
 import uvicorn
+from collections import Counter, namedtuple
+from contextlib import asynccontextmanager
+from operator import attrgetter
 from pathlib import Path
 from datetime import datetime
-import json
 import csv
+import heapq
+import logging
 import os
+import sys
 
+try:
+    import pandas as pd
+except ImportError:
+    pd = None  # Optional - loaders fall back to the stdlib csv reader
 
-app = FastAPI(title="Trades & Status API", description="API for client trade history and status")
+
+# Request-path logging goes through the logging module (a no-op above DEBUG
+# level) rather than print(), which writes to stdout while holding the GIL
+logger = logging.getLogger("trades_api")
+
+@asynccontextmanager
+async def lifespan(app):
+    """Load all CSV data before the first request is served.
+
+    Running this in the lifespan (rather than the __main__ block) means the
+    data and its indices are also loaded when the app is launched via
+    `uvicorn trades_api:app`, not just via `python trades_api.py`.
+    """
+    print("\n📊 Loading data files...")
+    load_trades_from_csv("trades.csv")
+    load_client_status_from_csv("client_status.csv")
+    load_credit_lines_from_csv("credit_lines.csv")
+    rebuild_document_index()
+    rebuild_stats()
+    yield
+
+app = FastAPI(
+    title="Trades & Status API",
+    description="API for client trade history and status",
+    default_response_class=ORJSONResponse,  # orjson serializes emoji-heavy dicts much faster than stdlib json
+    lifespan=lifespan
+)
 
 # Add CORS middleware to allow requests from anywhere (for development)
 app.add_middleware(
@@ -37,11 +75,146 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON responses - the per-row repeated keys in /trades and
+# /stats payloads compress 5-10x, tiny responses are left alone
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
+# Directory this script lives in - CSVs and trade documents are resolved
+# relative to it
+_HERE = Path(__file__).parent
+
 # Global storage
 TRADES = []
 CLIENT_STATUS = []
 CREDIT_LINES = []
+
+# Per-client trade index, rebuilt whenever the CSVs are (re)loaded, feeding
+# the top-5 selection below
+TRADES_BY_CLIENT = {}
+
+# Response bodies pre-serialized with orjson at load time (sorted, rendered
+# with emojis and status/credit lines, and JSON-encoded per client) - the
+# hot endpoints return these bytes directly, so the request path does no
+# string formatting or JSON encoding at all
+TRADES_JSON_BY_CLIENT = {}
+STATUS_JSON_BY_CLIENT = {}
+CREDIT_JSON_BY_CLIENT = {}
+
+# /stats snapshot, recomputed after each (re)load instead of per request;
+# STATS_JSON holds the orjson-encoded bytes served to pollers
+STATS_CACHE = {"message": "No data loaded"}
+STATS_JSON = orjson.dumps(STATS_CACHE)
+
+# Data generation counter, bumped by /reload. The derived weak ETag lets
+# polling clients get a 304 instead of the full payload when nothing changed.
+RELOAD_VERSION = 0
+DATA_ETAG = 'W/"0"'
 TRADE_DOCUMENTS_DIR = "trade_documents"  # Directory containing trade documents
+TRADE_DOCUMENT_EXTENSIONS = {'.pdf', '.doc', '.docx', '.txt', '.xlsx', '.csv'}
+
+# Real MIME type per document extension so browsers can render/cache the
+# file instead of treating everything as an opaque download
+TRADE_DOCUMENT_MIME = {
+    '.pdf': 'application/pdf',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.txt': 'text/plain',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.csv': 'text/csv'
+}
+
+# trade_number -> document path, built by scanning the documents directory
+# once at startup/reload instead of stat-ing up to 6 candidates per request.
+# TRADE_DOC_STATS caches each file's stat result so FileResponse doesn't
+# re-stat on every download.
+TRADE_DOCS = {}
+TRADE_DOC_STATS = {}
+
+# Expected CSV columns and the default used when a value is missing/empty,
+# mirroring the safe_get defaults in the row-by-row loaders
+TRADE_COLUMNS = {
+    'trade_number': '', 'client_id': '', 'client_name': '', 'trade_date': '',
+    'start_date': '', 'product': '', 'direction': '', 'currency_pair': '',
+    'notional_amount': '', 'price': '', 'spread': '', 'expiry_date': ''
+}
+STATUS_COLUMNS = {
+    'client_id': '', 'client_name': '', 'kyc_status': 'Unknown',
+    'onboarding_status': 'Unknown', 'ccg_status': 'Unknown',
+    'contract_status': 'Unknown', 'client_status': 'Unknown'
+}
+CREDIT_COLUMNS = {
+    'client_id': '', 'client_name': '',
+    'spot_line_approved': '0', 'spot_line_used': '0', 'spot_line_%': '0',
+    'fwd_line_approved': '0', 'fwd_line_used': '0', 'fwd_line_%': '0',
+    'deriv_line_approved': '0', 'deriv_line_used': '0', 'deriv_line_%': '0'
+}
+
+# In-memory trade record: a namedtuple instead of a dict, so each row is a
+# fixed-size tuple (no per-row hash table) - roughly 4-5x less memory on
+# large CSVs. trade_date_sort is internal and excluded from responses.
+Trade = namedtuple('Trade', list(TRADE_COLUMNS) + ['trade_date_sort'])
+TRADE_RESPONSE_FIELDS = Trade._fields[:-1]
+
+def make_trade(rec):
+    """Build a Trade from a cleaned row dict, interning low-cardinality fields."""
+    return Trade(
+        trade_number=rec['trade_number'],
+        client_id=sys.intern(rec['client_id']),
+        client_name=rec['client_name'],
+        trade_date=rec['trade_date'],
+        start_date=rec['start_date'],
+        product=sys.intern(rec['product']),
+        direction=sys.intern(rec['direction']),
+        currency_pair=sys.intern(rec['currency_pair']),
+        notional_amount=rec['notional_amount'],
+        price=rec['price'],
+        spread=rec['spread'],
+        expiry_date=rec['expiry_date'],
+        trade_date_sort=parse_date(rec['trade_date'])
+    )
+
+# Rows per chunk when streaming the (potentially large) trades CSV
+TRADES_CSV_CHUNKSIZE = 50_000
+
+def _clean_csv_frame(df, columns, required):
+    """Apply the row-loop cleanup to a dataframe: strip values, fill
+    missing/empty cells with the column default, drop rows missing any
+    required column."""
+    for col, default in columns.items():
+        if col in df.columns:
+            stripped = df[col].str.strip()
+            df[col] = stripped.where(stripped != '', default) if default else stripped
+        else:
+            df[col] = default
+    df = df[list(columns)]
+    for col in required:
+        df = df[df[col] != '']
+    return df
+
+def iter_csv_chunks(csv_path, columns, required, chunksize=None):
+    """Yield cleaned row-dict batches from a CSV.
+
+    With a chunksize, pandas' C tokenizer parses the next chunk while the
+    Python-side consumer indexes the previous one, and the whole file is
+    never materialized as rows twice.
+
+    on_bad_lines='warn' skips ragged rows one at a time, matching the
+    per-row error handling of the csv fallback - a single malformed line
+    must not abort the whole load (and wipe the previous snapshot on
+    /reload).
+    """
+    parsed = pd.read_csv(csv_path, dtype=str, keep_default_na=False,
+                         on_bad_lines='warn', chunksize=chunksize)
+    frames = parsed if chunksize else (parsed,)
+    for df in frames:
+        yield _clean_csv_frame(df, columns, required).to_dict('records')
+
+def read_csv_bulk(csv_path, columns, required):
+    """Read a whole CSV with pandas in one vectorized pass and return row dicts."""
+    records = []
+    for batch in iter_csv_chunks(csv_path, columns, required):
+        records.extend(batch)
+    return records
 
 def safe_get(row, key, default=""):
     """Safely get value from CSV row, handling None values."""
@@ -50,84 +223,305 @@ def safe_get(row, key, default=""):
         return default
     return str(value).strip() if value else default
 
+# Status text -> traffic light, keyed on the lowercased status
+_STATUS_EMOJI = {
+    'ok': '🟢',
+    'en curso': '🟡',
+    'nok': '🔴'
+}
+
 def status_to_emoji(status):
     """Convert status text to emoji traffic light."""
-    status_lower = status.lower()
-    if status_lower == 'ok':
-        return '🟢'
-    elif status_lower == 'en curso':
-        return '🟡'
-    elif status_lower == 'nok':
-        return '🔴'
-    else:
-        return '⚪'  # Unknown status
+    return _STATUS_EMOJI.get(status.lower() if status else '', '⚪')
 
 def credit_percentage_to_emoji(percentage_str):
     """Convert credit line percentage to traffic light emoji."""
     try:
         percentage = float(percentage_str)
-        if percentage >= 100:
-            return '🔴'  # Red - Over limit
-        elif percentage >= 80:
-            return '🟡'  # Amber - Near limit  
+        if percentage < 80:
+            return '🟢'  # Green - Safe (common case, checked first)
+        elif percentage < 100:
+            return '🟡'  # Amber - Near limit
         else:
-            return '🟢'  # Green - Safe
+            return '🔴'  # Red - Over limit
     except (ValueError, TypeError):
         return '⚪'  # Unknown
 
 def parse_date(date_str):
-    """Parse DD/MM/YYYY date string and return as datetime for sorting."""
+    """Parse a DD/MM/YYYY date string into a (year, month, day) sort key.
+
+    The fixed format means plain slicing + int() works and is several
+    times faster than datetime.strptime; the result is only ever used
+    for ordering trades, so no datetime object is needed.
+    """
     try:
-        return datetime.strptime(date_str, '%d/%m/%Y')
-    except:
-        return datetime.min
+        return (int(date_str[6:10]), int(date_str[3:5]), int(date_str[0:2]))
+    except (ValueError, TypeError, IndexError):
+        return (0, 0, 0)
+
+def build_status_response(client_status):
+    """Build the status-with-emojis response dict for one client."""
+    return {
+        'client_id': client_status['client_id'],
+        'client_name': client_status['client_name'],
+        'kyc_status': client_status['kyc_status'],
+        'kyc_emoji': status_to_emoji(client_status['kyc_status']),
+        'onboarding_status': client_status['onboarding_status'],
+        'onboarding_emoji': status_to_emoji(client_status['onboarding_status']),
+        'ccg_status': client_status['ccg_status'],
+        'ccg_emoji': status_to_emoji(client_status['ccg_status']),
+        'contract_status': client_status['contract_status'],
+        'contract_emoji': status_to_emoji(client_status['contract_status']),
+        'client_status': client_status['client_status'],
+        'client_emoji': status_to_emoji(client_status['client_status']),
+        'status_line': f"{status_to_emoji(client_status['kyc_status'])} KYC  {status_to_emoji(client_status['onboarding_status'])} Onboarding  {status_to_emoji(client_status['ccg_status'])} CCG  {status_to_emoji(client_status['contract_status'])} Contract  {status_to_emoji(client_status['client_status'])} Client"
+    }
+
+def build_unknown_status_response(client_id):
+    """Build the all-Unknown status response for clients we have no data for."""
+    return build_status_response({
+        'client_id': client_id,
+        'client_name': 'Unknown',
+        'kyc_status': 'Unknown',
+        'onboarding_status': 'Unknown',
+        'ccg_status': 'Unknown',
+        'contract_status': 'Unknown',
+        'client_status': 'Unknown'
+    })
+
+def build_credit_response(client_credit):
+    """Build the credit-lines-with-emojis response dict for one client."""
+    spot_pct = client_credit['spot_line_%']
+    fwd_pct = client_credit['fwd_line_%']
+    deriv_pct = client_credit['deriv_line_%']
+
+    return {
+        'client_id': client_credit['client_id'],
+        'client_name': client_credit['client_name'],
+        'spot_line_approved': client_credit['spot_line_approved'],
+        'spot_line_used': client_credit['spot_line_used'],
+        'spot_line_%': spot_pct,
+        'spot_emoji': credit_percentage_to_emoji(spot_pct),
+        'fwd_line_approved': client_credit['fwd_line_approved'],
+        'fwd_line_used': client_credit['fwd_line_used'],
+        'fwd_line_%': fwd_pct,
+        'fwd_emoji': credit_percentage_to_emoji(fwd_pct),
+        'deriv_line_approved': client_credit['deriv_line_approved'],
+        'deriv_line_used': client_credit['deriv_line_used'],
+        'deriv_line_%': deriv_pct,
+        'deriv_emoji': credit_percentage_to_emoji(deriv_pct),
+        'credit_line': f"{credit_percentage_to_emoji(spot_pct)} Spot: {spot_pct}%  {credit_percentage_to_emoji(fwd_pct)} Fwd: {fwd_pct}%  {credit_percentage_to_emoji(deriv_pct)} Derivados: {deriv_pct}%"
+    }
+
+def build_unknown_credit_response(client_id):
+    """Build the zeroed credit response for clients we have no data for."""
+    return build_credit_response({
+        'client_id': client_id,
+        'client_name': 'Unknown',
+        'spot_line_approved': '0',
+        'spot_line_used': '0',
+        'spot_line_%': '0',
+        'fwd_line_approved': '0',
+        'fwd_line_used': '0',
+        'fwd_line_%': '0',
+        'deriv_line_approved': '0',
+        'deriv_line_used': '0',
+        'deriv_line_%': '0'
+    })
+
+# Sort key for trades: the trade_date pre-parsed during CSV ingestion.
+# attrgetter is C-implemented, so the sort never calls back into Python.
+_by_trade_date = attrgetter('trade_date_sort')
+
+def etag_response(request, body):
+    """Serve cached JSON bytes with the current data ETag, honouring
+    If-None-Match with a 304 so unchanged payloads are never re-sent."""
+    if request.headers.get('if-none-match') == DATA_ETAG:
+        return Response(status_code=304)
+    return Response(content=body, media_type="application/json", headers={'ETag': DATA_ETAG})
+
+def install_trades(trades, trades_by_client):
+    """Publish a new trades snapshot.
+
+    Builds the sorted top-5 serialized cache from the new index, then
+    rebinds all three globals in a single tuple assignment. The rebind is
+    atomic under the GIL, so in-flight requests see either the old snapshot
+    or the new one - never a half-loaded mix.
+    """
+    global TRADES, TRADES_BY_CLIENT, TRADES_JSON_BY_CLIENT
+
+    json_by_client = {}
+    for client_id, client_trades in trades_by_client.items():
+        # nlargest is O(N) per client vs O(N log N) for a full sort, and
+        # already yields the trades newest-first; the CSV need not be
+        # pre-sorted by date
+        newest = heapq.nlargest(5, client_trades, key=_by_trade_date)
+        top5 = [dict(zip(TRADE_RESPONSE_FIELDS, trade)) for trade in newest]
+        json_by_client[client_id] = orjson.dumps(top5)
+
+    TRADES, TRADES_BY_CLIENT, TRADES_JSON_BY_CLIENT = \
+        trades, trades_by_client, json_by_client
+
+def rebuild_document_index():
+    """Scan the trade documents directory and index files by trade number."""
+    global TRADE_DOCS, TRADE_DOC_STATS
+
+    docs = {}
+    doc_stats = {}
+    docs_dir = _HERE / TRADE_DOCUMENTS_DIR
+
+    if docs_dir.exists():
+        for doc_path in docs_dir.iterdir():
+            if doc_path.is_file() and doc_path.suffix.lower() in TRADE_DOCUMENT_EXTENSIONS:
+                docs[doc_path.stem] = doc_path
+                doc_stats[doc_path.stem] = doc_path.stat()
+        print(f"✅ Indexed {len(docs)} trade documents")
+    else:
+        print(f"⚠️  Documents directory not found: {docs_dir}")
+
+    TRADE_DOCS, TRADE_DOC_STATS = docs, doc_stats
+
+def rebuild_stats():
+    """Recompute the /stats snapshot from the loaded data.
+
+    Called once after the CSVs are (re)loaded so /stats never re-scans
+    TRADES and CLIENT_STATUS per request.
+    """
+    global STATS_CACHE, STATS_JSON
+
+    if not TRADES and not CLIENT_STATUS:
+        STATS_CACHE = {"message": "No data loaded"}
+        STATS_JSON = orjson.dumps(STATS_CACHE)
+        return
+
+    stats = {
+        "trades": {
+            "total_trades": len(TRADES),
+            "unique_clients_with_trades": 0,
+            "avg_trades_per_client": 0
+        },
+        "status": {
+            "total_statuses": len(CLIENT_STATUS),
+            "status_breakdown": {}
+        },
+        "credit": {
+            "total_credit_lines": len(CREDIT_LINES)
+        }
+    }
+
+    # Trades statistics
+    if TRADES:
+        client_counts = Counter(trade.client_id for trade in TRADES)
+        stats["trades"]["unique_clients_with_trades"] = len(client_counts)
+        stats["trades"]["avg_trades_per_client"] = round(len(TRADES) / len(client_counts), 2) if client_counts else 0
+        stats["trades"]["clients_with_most_trades"] = client_counts.most_common(5)
+
+    # Status statistics - one pass over CLIENT_STATUS updating all five
+    # field counters, instead of a separate traversal per field
+    if CLIENT_STATUS:
+        fields = ('kyc_status', 'onboarding_status', 'ccg_status', 'contract_status', 'client_status')
+        counters = {field: Counter() for field in fields}
+        for status in CLIENT_STATUS:
+            for field in fields:
+                counters[field][status.get(field, 'Unknown')] += 1
+        stats["status"]["status_breakdown"] = {field: dict(counter)
+                                               for field, counter in counters.items()}
+
+    STATS_CACHE, STATS_JSON = stats, orjson.dumps(stats)
+
+def install_statuses(statuses):
+    """Publish a new client-status snapshot (atomic rebind, see install_trades)."""
+    global CLIENT_STATUS, STATUS_JSON_BY_CLIENT
+
+    json_by_client = {}
+    for status in statuses:
+        # Share one string object with the trade records for the same client
+        client_id = sys.intern(status['client_id'])
+        status['client_id'] = client_id
+        # First row wins on duplicate client_ids, matching the old
+        # linear-scan-with-break lookup
+        if client_id not in json_by_client:
+            json_by_client[client_id] = orjson.dumps(build_status_response(status))
+
+    CLIENT_STATUS, STATUS_JSON_BY_CLIENT = statuses, json_by_client
+
+def install_credit_lines(credit_lines):
+    """Publish a new credit-lines snapshot (atomic rebind, see install_trades)."""
+    global CREDIT_LINES, CREDIT_JSON_BY_CLIENT
+
+    json_by_client = {}
+    for credit_line in credit_lines:
+        client_id = sys.intern(credit_line['client_id'])
+        credit_line['client_id'] = client_id
+        # First row wins on duplicate client_ids, as with the old scan
+        if client_id not in json_by_client:
+            json_by_client[client_id] = orjson.dumps(build_credit_response(credit_line))
+
+    CREDIT_LINES, CREDIT_JSON_BY_CLIENT = credit_lines, json_by_client
 
 def load_trades_from_csv(csv_file="trades.csv"):
-    """Load trades from CSV file with proper null handling."""
-    global TRADES
-    
+    """Load trades from CSV file with proper null handling.
+
+    Builds the new data into locals and publishes it via install_trades
+    at the end, so requests served during a /reload never see a
+    partially-loaded list.
+    """
     try:
-        csv_path = Path(__file__).parent / csv_file
-        
-        with open(csv_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            TRADES = []
-            
+        csv_path = _HERE / csv_file
+
+        trades = []
+        trades_by_client = {}
+
+        if pd is not None:
+            # Fast path: vectorized C-level parse, streamed in chunks so the
+            # per-client index is built while the next chunk is being parsed
+            for batch in iter_csv_chunks(csv_path, TRADE_COLUMNS, ('trade_number', 'client_id'),
+                                         chunksize=TRADES_CSV_CHUNKSIZE):
+                for rec in batch:
+                    trade = make_trade(rec)
+                    trades.append(trade)
+                    trades_by_client.setdefault(trade.client_id, []).append(trade)
+            install_trades(trades, trades_by_client)
+            print(f"✅ Loaded {len(trades)} trades from {csv_file}")
+            return True
+
+        with open(csv_path, 'r', encoding='utf-8', newline='') as csvfile:
+            # csv.reader yields plain lists - unlike DictReader there is no
+            # fresh 12-key dict allocated per row, and columns are fetched
+            # by position using indices resolved once from the header
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
+            idx = {name.strip(): i for i, name in enumerate(header)}
+            indices = [idx.get(name, -1) for name in TRADE_COLUMNS]
+
             for row_num, row in enumerate(reader, start=2):
                 try:
-                    trade = {
-                        'trade_number': safe_get(row, 'trade_number'),
-                        'client_id': safe_get(row, 'client_id'),
-                        'client_name': safe_get(row, 'client_name'),
-                        'trade_date': safe_get(row, 'trade_date'),
-                        'start_date': safe_get(row, 'start_date'),
-                        'product': safe_get(row, 'product'),
-                        'direction': safe_get(row, 'direction'),
-                        'currency_pair': safe_get(row, 'currency_pair'),
-                        'notional_amount': safe_get(row, 'notional_amount'),
-                        'price': safe_get(row, 'price'),
-                        'spread': safe_get(row, 'spread'),
-                        'expiry_date': safe_get(row, 'expiry_date', "")
-                    }
-                    
+                    ncols = len(row)
+                    rec = dict(zip(TRADE_COLUMNS,
+                                   (row[i].strip() if 0 <= i < ncols else ''
+                                    for i in indices)))
+
                     # Skip rows with missing critical data
-                    if not trade['trade_number'] or not trade['client_id']:
+                    if not rec['trade_number'] or not rec['client_id']:
                         print(f"⚠️  Skipping trade row {row_num}: Missing trade_number or client_id")
                         continue
-                    
-                    TRADES.append(trade)
-                    
+
+                    trade = make_trade(rec)
+                    trades.append(trade)
+                    trades_by_client.setdefault(trade.client_id, []).append(trade)
+
                 except Exception as e:
                     print(f"⚠️  Error processing trade row {row_num}: {e}")
                     continue
-            
-            print(f"✅ Loaded {len(TRADES)} trades from {csv_file}")
+
+            install_trades(trades, trades_by_client)
+            print(f"✅ Loaded {len(trades)} trades from {csv_file}")
             return True
             
     except FileNotFoundError:
         print(f"❌ CSV file not found: {csv_file}")
         # Create minimal sample data for testing
-        TRADES = [
+        sample_trades = [
             {
                 'client_id': '93.685.712-6',
                 'client_name': 'Comercial Metropolitana SA',
@@ -157,25 +551,34 @@ def load_trades_from_csv(csv_file="trades.csv"):
                 'expiry_date': '08/08/2025'
             }
         ]
-        print(f"⚠️ Using sample trade data: {len(TRADES)} trades")
+        trades = [make_trade(rec) for rec in sample_trades]
+        trades_by_client = {}
+        for trade in trades:
+            trades_by_client.setdefault(trade.client_id, []).append(trade)
+        install_trades(trades, trades_by_client)
+        print(f"⚠️ Using sample trade data: {len(trades)} trades")
         return False
-        
+
     except Exception as e:
         print(f"❌ Error loading trades CSV: {e}")
-        TRADES = []
+        install_trades([], {})
         return False
 
 def load_client_status_from_csv(csv_file="client_status.csv"):
-    """Load client status from CSV file."""
-    global CLIENT_STATUS
-    
+    """Load client status from CSV file (atomic snapshot swap, see install_statuses)."""
     try:
-        csv_path = Path(__file__).parent / csv_file
-        
+        csv_path = _HERE / csv_file
+
+        if pd is not None:
+            statuses = read_csv_bulk(csv_path, STATUS_COLUMNS, ('client_id',))
+            install_statuses(statuses)
+            print(f"✅ Loaded {len(statuses)} client statuses from {csv_file}")
+            return True
+
         with open(csv_path, 'r', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
-            CLIENT_STATUS = []
-            
+            statuses = []
+
             for row_num, row in enumerate(reader, start=2):
                 try:
                     status = {
@@ -193,19 +596,20 @@ def load_client_status_from_csv(csv_file="client_status.csv"):
                         print(f"⚠️  Skipping status row {row_num}: Missing client_id")
                         continue
                     
-                    CLIENT_STATUS.append(status)
-                    
+                    statuses.append(status)
+
                 except Exception as e:
                     print(f"⚠️  Error processing status row {row_num}: {e}")
                     continue
-            
-            print(f"✅ Loaded {len(CLIENT_STATUS)} client statuses from {csv_file}")
+
+            install_statuses(statuses)
+            print(f"✅ Loaded {len(statuses)} client statuses from {csv_file}")
             return True
-            
+
     except FileNotFoundError:
         print(f"❌ CSV file not found: {csv_file}")
         # Create sample status data for testing
-        CLIENT_STATUS = [
+        statuses = [
             {
                 'client_id': '93.685.712-6',
                 'client_name': 'Comercial Metropolitana SA',
@@ -216,25 +620,30 @@ def load_client_status_from_csv(csv_file="client_status.csv"):
                 'client_status': 'En Curso'
             }
         ]
-        print(f"⚠️ Using sample status data: {len(CLIENT_STATUS)} statuses")
+        install_statuses(statuses)
+        print(f"⚠️ Using sample status data: {len(statuses)} statuses")
         return False
-        
+
     except Exception as e:
         print(f"❌ Error loading status CSV: {e}")
-        CLIENT_STATUS = []
+        install_statuses([])
         return False
 
 def load_credit_lines_from_csv(csv_file="credit_lines.csv"):
-    """Load credit lines from CSV file."""
-    global CREDIT_LINES
-    
+    """Load credit lines from CSV file (atomic snapshot swap, see install_credit_lines)."""
     try:
-        csv_path = Path(__file__).parent / csv_file
-        
+        csv_path = _HERE / csv_file
+
+        if pd is not None:
+            credit_lines = read_csv_bulk(csv_path, CREDIT_COLUMNS, ('client_id',))
+            install_credit_lines(credit_lines)
+            print(f"✅ Loaded {len(credit_lines)} credit lines from {csv_file}")
+            return True
+
         with open(csv_path, 'r', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
-            CREDIT_LINES = []
-            
+            credit_lines = []
+
             for row_num, row in enumerate(reader, start=2):
                 try:
                     credit_line = {
@@ -256,19 +665,20 @@ def load_credit_lines_from_csv(csv_file="credit_lines.csv"):
                         print(f"⚠️  Skipping credit line row {row_num}: Missing client_id")
                         continue
                     
-                    CREDIT_LINES.append(credit_line)
-                    
+                    credit_lines.append(credit_line)
+
                 except Exception as e:
                     print(f"⚠️  Error processing credit line row {row_num}: {e}")
                     continue
-            
-            print(f"✅ Loaded {len(CREDIT_LINES)} credit lines from {csv_file}")
+
+            install_credit_lines(credit_lines)
+            print(f"✅ Loaded {len(credit_lines)} credit lines from {csv_file}")
             return True
-            
+
     except FileNotFoundError:
         print(f"❌ CSV file not found: {csv_file}")
         # Create sample credit line data for testing
-        CREDIT_LINES = [
+        credit_lines = [
             {
                 'client_id': '93.685.712-6',
                 'client_name': 'Comercial Metropolitana SA',
@@ -283,12 +693,13 @@ def load_credit_lines_from_csv(csv_file="credit_lines.csv"):
                 'deriv_line_%': '105'
             }
         ]
-        print(f"⚠️ Using sample credit line data: {len(CREDIT_LINES)} credit lines")
+        install_credit_lines(credit_lines)
+        print(f"⚠️ Using sample credit line data: {len(credit_lines)} credit lines")
         return False
-        
+
     except Exception as e:
         print(f"❌ Error loading credit lines CSV: {e}")
-        CREDIT_LINES = []
+        install_credit_lines([])
         return False
 
 @app.get("/")
@@ -322,179 +733,111 @@ async def health_check():
         "timestamp": datetime.now().isoformat()
     }
 
-@app.get("/trades/{client_id}")
-async def get_client_trades(client_id: str):
-    """Get last 5 trades for a specific client, ordered by trade_date."""
-    
-    print(f"📋 Request for trades: client_id={client_id}")
-    
-    # Find all trades for this client
-    client_trades = [trade for trade in TRADES if trade['client_id'] == client_id]
-    
-    if not client_trades:
-        print(f"❌ No trades found for client {client_id}")
+async def get_client_trades(request):
+    """Get last 5 trades for a specific client, ordered by trade_date.
+
+    Registered as a plain Starlette route (see below) rather than a
+    FastAPI endpoint: the handler is a dict lookup on pre-serialized
+    bytes, so FastAPI's per-request dependency-injection and validation
+    would be the dominant cost.
+    """
+    client_id = request.path_params['client_id']
+    logger.debug("Request for trades: client_id=%s", client_id)
+
+    # Serve the pre-serialized response bytes (sorted, sliced and JSON-encoded
+    # at load time, so the request path is a dict lookup + socket write)
+    body = TRADES_JSON_BY_CLIENT.get(client_id)
+
+    if not body:
+        logger.debug("No trades found for client %s", client_id)
         raise HTTPException(status_code=404, detail=f"No trades found for client {client_id}")
-    
-    # Sort by trade_date (most recent first)
-    try:
-        client_trades.sort(key=lambda x: parse_date(x['trade_date']), reverse=True)
-    except Exception as e:
-        print(f"⚠️ Warning: Could not sort trades by date: {e}")
-    
-    # Return last 5 trades
-    last_5_trades = client_trades[:5]
-    
-    print(f"✅ Returning {len(last_5_trades)} trades for client {client_id}")
-    
-    return last_5_trades
 
-@app.get("/status/{client_id}")
-async def get_client_status(client_id: str):
-    """Get client status with traffic light emojis."""
-    
-    print(f"🚦 Request for status: client_id={client_id}")
-    
-    # Find status for this client
-    client_status = None
-    for status in CLIENT_STATUS:
-        if status['client_id'] == client_id:
-            client_status = status
-            break
-    
-    if not client_status:
-        print(f"❌ No status found for client {client_id}")
+    return etag_response(request, body)
+
+async def get_client_status(request):
+    """Get client status with traffic light emojis.
+
+    Registered as a plain Starlette route, like get_client_trades.
+    """
+    client_id = request.path_params['client_id']
+    logger.debug("Request for status: client_id=%s", client_id)
+
+    # Serve the pre-serialized response (rendered and JSON-encoded at load time)
+    body = STATUS_JSON_BY_CLIENT.get(client_id)
+
+    if body is None:
+        logger.debug("No status found for client %s", client_id)
         # Return unknown status for all fields
-        client_status = {
-            'client_id': client_id,
-            'client_name': 'Unknown',
-            'kyc_status': 'Unknown',
-            'onboarding_status': 'Unknown',
-            'ccg_status': 'Unknown',
-            'contract_status': 'Unknown',
-            'client_status': 'Unknown'
-        }
-    
-    # Convert statuses to emojis
-    status_with_emojis = {
-        'client_id': client_status['client_id'],
-        'client_name': client_status['client_name'],
-        'kyc_status': client_status['kyc_status'],
-        'kyc_emoji': status_to_emoji(client_status['kyc_status']),
-        'onboarding_status': client_status['onboarding_status'],
-        'onboarding_emoji': status_to_emoji(client_status['onboarding_status']),
-        'ccg_status': client_status['ccg_status'],
-        'ccg_emoji': status_to_emoji(client_status['ccg_status']),
-        'contract_status': client_status['contract_status'],
-        'contract_emoji': status_to_emoji(client_status['contract_status']),
-        'client_status': client_status['client_status'],
-        'client_emoji': status_to_emoji(client_status['client_status']),
-        'status_line': f"{status_to_emoji(client_status['kyc_status'])} KYC  {status_to_emoji(client_status['onboarding_status'])} Onboarding  {status_to_emoji(client_status['ccg_status'])} CCG  {status_to_emoji(client_status['contract_status'])} Contract  {status_to_emoji(client_status['client_status'])} Client"
-    }
-    
-    print(f"✅ Returning status for client {client_id}: {status_with_emojis['status_line']}")
-    
-    return status_with_emojis
+        return ORJSONResponse(build_unknown_status_response(client_id))
+
+    return etag_response(request, body)
+
+# Hot routes bypass FastAPI routing/DI; HTTPExceptions raised inside them are
+# still rendered by the app's exception middleware
+app.router.routes.append(Route('/trades/{client_id}', get_client_trades))
+app.router.routes.append(Route('/status/{client_id}', get_client_status))
 
 @app.get("/credit/{client_id}")
-async def get_client_credit_lines(client_id: str):
+async def get_client_credit_lines(client_id: str, request: Request):
     """Get client credit line utilization with traffic light indicators."""
     
-    print(f"💳 Request for credit lines: client_id={client_id}")
-    
-    # Find credit lines for this client
-    client_credit = None
-    for credit in CREDIT_LINES:
-        if credit['client_id'] == client_id:
-            client_credit = credit
-            break
-    
-    if not client_credit:
-        print(f"❌ No credit lines found for client {client_id}")
+    logger.debug("Request for credit lines: client_id=%s", client_id)
+
+    # Serve the pre-serialized response (rendered and JSON-encoded at load time)
+    body = CREDIT_JSON_BY_CLIENT.get(client_id)
+
+    if body is None:
+        logger.debug("No credit lines found for client %s", client_id)
         # Return unknown/zero credit lines
-        client_credit = {
-            'client_id': client_id,
-            'client_name': 'Unknown',
-            'spot_line_approved': '0',
-            'spot_line_used': '0',
-            'spot_line_%': '0',
-            'fwd_line_approved': '0',
-            'fwd_line_used': '0',
-            'fwd_line_%': '0',
-            'deriv_line_approved': '0',
-            'deriv_line_used': '0',
-            'deriv_line_%': '0'
-        }
-    
-    # Convert percentages to emojis and format display
-    spot_pct = client_credit['spot_line_%']
-    fwd_pct = client_credit['fwd_line_%']
-    deriv_pct = client_credit['deriv_line_%']
-    
-    credit_with_emojis = {
-        'client_id': client_credit['client_id'],
-        'client_name': client_credit['client_name'],
-        'spot_line_approved': client_credit['spot_line_approved'],
-        'spot_line_used': client_credit['spot_line_used'],
-        'spot_line_%': spot_pct,
-        'spot_emoji': credit_percentage_to_emoji(spot_pct),
-        'fwd_line_approved': client_credit['fwd_line_approved'],
-        'fwd_line_used': client_credit['fwd_line_used'],
-        'fwd_line_%': fwd_pct,
-        'fwd_emoji': credit_percentage_to_emoji(fwd_pct),
-        'deriv_line_approved': client_credit['deriv_line_approved'],
-        'deriv_line_used': client_credit['deriv_line_used'],
-        'deriv_line_%': deriv_pct,
-        'deriv_emoji': credit_percentage_to_emoji(deriv_pct),
-        'credit_line': f"{credit_percentage_to_emoji(spot_pct)} Spot: {spot_pct}%  {credit_percentage_to_emoji(fwd_pct)} Fwd: {fwd_pct}%  {credit_percentage_to_emoji(deriv_pct)} Derivados: {deriv_pct}%"
-    }
-    
-    print(f"✅ Returning credit lines for client {client_id}: {credit_with_emojis['credit_line']}")
-    
-    return credit_with_emojis
+        return build_unknown_credit_response(client_id)
+
+    return etag_response(request, body)
 
 @app.get("/document/{trade_number}")
 async def get_trade_document(trade_number: str):
     """Download trade document file by trade number."""
     
-    print(f"📄 Request for trade document: trade_number={trade_number}")
-    
-    # Ensure the documents directory exists
-    docs_dir = Path(__file__).parent / TRADE_DOCUMENTS_DIR
-    
-    if not docs_dir.exists():
-        print(f"❌ Documents directory not found: {docs_dir}")
-        raise HTTPException(status_code=404, detail="Documents directory not found")
-    
-    # Try different file extensions
-    possible_extensions = ['.pdf', '.doc', '.docx', '.txt', '.xlsx', '.csv']
-    document_path = None
-    
-    for ext in possible_extensions:
-        potential_path = docs_dir / f"{trade_number}{ext}"
-        if potential_path.exists():
-            document_path = potential_path
-            break
-    
+    logger.debug("Request for trade document: trade_number=%s", trade_number)
+
+    # Look up the pre-built index - no filesystem probing per request
+    document_path = TRADE_DOCS.get(trade_number)
+
     if not document_path:
-        print(f"❌ No document found for trade {trade_number}")
+        logger.debug("No document found for trade %s", trade_number)
         raise HTTPException(status_code=404, detail=f"No document found for trade {trade_number}")
-    
-    print(f"✅ Found document: {document_path}")
-    
-    # Return the file as a download
+
+    logger.debug("Found document: %s", document_path)
+
+    # Return the file with its real MIME type and the cached stat result
+    # (Starlette skips its own stat call and can serve via os.sendfile)
     return FileResponse(
         path=document_path,
         filename=document_path.name,
-        media_type='application/octet-stream'
+        media_type=TRADE_DOCUMENT_MIME.get(document_path.suffix.lower(), 'application/octet-stream'),
+        stat_result=TRADE_DOC_STATS.get(trade_number)
     )
 
 @app.get("/reload")
-async def reload_data():
-    """Reload both trades and status data from CSV files."""
+def reload_data():
+    """Reload both trades and status data from CSV files.
+
+    Declared as a plain def so FastAPI runs it in the anyio threadpool:
+    the CSV re-parse is blocking work that would otherwise stall the
+    event loop, while the atomic snapshot swap keeps concurrent readers
+    consistent.
+    """
+    global RELOAD_VERSION, DATA_ETAG
+
     trades_success = load_trades_from_csv("trades.csv")
     status_success = load_client_status_from_csv("client_status.csv")
     credit_success = load_credit_lines_from_csv("credit_lines.csv")
-    
+    rebuild_document_index()
+    rebuild_stats()
+
+    # New data generation -> new ETag, so conditional GETs refetch
+    RELOAD_VERSION += 1
+    DATA_ETAG = f'W/"{RELOAD_VERSION}"'
+
     return {
         "trades_success": trades_success,
         "status_success": status_success,
@@ -506,57 +849,15 @@ async def reload_data():
     }
 
 @app.get("/stats")
-async def get_stats():
-    """Get statistics about loaded data."""
-    if not TRADES and not CLIENT_STATUS:
-        return {"message": "No data loaded"}
-    
-    stats = {
-        "trades": {
-            "total_trades": len(TRADES),
-            "unique_clients_with_trades": 0,
-            "avg_trades_per_client": 0
-        },
-        "status": {
-            "total_statuses": len(CLIENT_STATUS),
-            "status_breakdown": {}
-        },
-        "credit": {
-            "total_credit_lines": len(CREDIT_LINES)
-        }
-    }
-    
-    # Trades statistics
-    if TRADES:
-        client_counts = {}
-        for trade in TRADES:
-            client_id = trade['client_id']
-            client_counts[client_id] = client_counts.get(client_id, 0) + 1
-        
-        stats["trades"]["unique_clients_with_trades"] = len(client_counts)
-        stats["trades"]["avg_trades_per_client"] = round(len(TRADES) / len(client_counts), 2) if client_counts else 0
-        stats["trades"]["clients_with_most_trades"] = sorted(client_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    
-    # Status statistics
-    if CLIENT_STATUS:
-        for field in ['kyc_status', 'onboarding_status', 'ccg_status', 'contract_status', 'client_status']:
-            field_stats = {}
-            for status in CLIENT_STATUS:
-                value = status.get(field, 'Unknown')
-                field_stats[value] = field_stats.get(value, 0) + 1
-            stats["status"]["status_breakdown"][field] = field_stats
-    
-    return stats
+async def get_stats(request: Request):
+    """Get statistics about loaded data (precomputed and pre-serialized at load time)."""
+    return etag_response(request, STATS_JSON)
 
 if __name__ == "__main__":
     print("🚀 Starting Enhanced Trades, Status & Credit API Server...")
-    
-    # Load data on startup
-    print("\n📊 Loading data files...")
-    load_trades_from_csv("trades.csv")
-    load_client_status_from_csv("client_status.csv")
-    load_credit_lines_from_csv("credit_lines.csv")
-    
+
+    # Data is loaded by the FastAPI lifespan before the first request
+
     print("\n📡 Server will be available at:")
     print("   - Main API: http://127.0.0.1:8001")
     print("   - Health: http://127.0.0.1:8001/health")
@@ -566,5 +867,9 @@ if __name__ == "__main__":
     print("   - Example credit: http://127.0.0.1:8001/credit/93.685.712-6")
     print()
     
-    # Start the server
-    uvicorn.run(app, host="127.0.0.1", port=8001, log_level="info")
\ No newline at end of file
+    # Start the server (uvloop + httptools come with uvicorn[standard] and
+    # are noticeably faster than the default asyncio loop / pure-Python parser).
+    # The app is passed as an import string so uvicorn can spawn one worker
+    # per core; each worker loads its own data via the lifespan.
+    uvicorn.run("trades_api:app", host="127.0.0.1", port=8001, workers=os.cpu_count(),
+                loop="uvloop", http="httptools", log_level="warning")
\ No newline at end of file